@@ -1,29 +1,129 @@
 import json
 import os
 import boto3
-import hashlib
+import contextvars
+import functools
+import inspect
+import random
+import re
+import secrets
+import threading
 import time
+import traceback
+import types
 import uuid
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-# Initialize AWS clients
-ec2_client = boto3.client('ec2')
-cloudwatch_client = boto3.client('cloudwatch')
-sns_client = boto3.client('sns')
-dynamodb = boto3.resource('dynamodb')
-bedrock_runtime = boto3.client('bedrock-runtime', region_name=os.environ.get('BEDROCK_REGION', 'us-east-1'))
+try:
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:
+    _parse_datetime = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+def _dumps(obj):
+    """Serialize to a JSON str (orjson when available)"""
+    if orjson:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, default=str, separators=(',', ':'))
+
+def _loads(data):
+    """Parse JSON from str or bytes (orjson when available)"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Shared client config: keep-alive connections reused across warm invocations
+_cfg = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},  # _awscall adds throttling retries on top
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10
+)
+_session = boto3.Session()
+
+# Shared worker pool for overlapping independent AWS calls (kept below max_pool_connections)
+_io_pool = ThreadPoolExecutor(max_workers=8)
+
+# Email of the user behind the current request, read by log_action
+CURRENT_USER_EMAIL = contextvars.ContextVar('current_user_email', default='anonymous')
+
+def _submit(fn, *args, **kwargs):
+    """Run fn on the shared pool inside a copy of the caller's context (keeps CURRENT_USER_EMAIL)"""
+    return _io_pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+# Initialize AWS clients (hot path)
+ec2_client = _session.client('ec2', config=_cfg)
+cloudwatch_client = _session.client('cloudwatch', config=_cfg)
+dynamodb = _session.resource('dynamodb', config=_cfg)
+
+# The Bedrock client is not needed by every invocation, so it is built on first use,
+# possibly on a pool thread; Session.client is not thread-safe, so construction is serialized
+_client_lock = threading.Lock()
+_bedrock_client = None
+
+def _get_bedrock():
+    # Double-checked so concurrent first callers share one client
+    global _bedrock_client
+    if _bedrock_client is None:
+        with _client_lock:
+            if _bedrock_client is None:
+                # Model responses routinely take longer than the default read timeout
+                _bedrock_client = _session.client('bedrock-runtime', region_name=os.environ.get('BEDROCK_REGION', 'us-east-1'),
+                                                  config=_cfg.merge(Config(read_timeout=60)))
+    return _bedrock_client
 
 MODEL_ID = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20241022-v2:0')
 APPROVAL_SNS_TOPIC = os.environ.get('APPROVAL_SNS_TOPIC', '')
 MAX_INSTANCE_COST_PER_HOUR = float(os.environ.get('MAX_INSTANCE_COST_PER_HOUR', '1.0'))
 ACTION_LOG_TABLE = os.environ.get('ACTION_LOG_TABLE', 'ec2-management-actions')
 CONFIRMATION_TABLE = os.environ.get('CONFIRMATION_TABLE', 'ec2-confirmation-tokens')
+DEBUG = os.environ.get('DEBUG') == '1'  # Log (truncated) request events
+VERBOSE = os.environ.get('VERBOSE') == '1'  # Have the model phrase every action result
+
+# Action log GSI: every item shares one partition so the index is timestamp-ordered
+ACTION_LOG_INDEX = 'ByTimestamp'
+ACTION_LOG_ACTION_INDEX = 'ByActionTs'  # Sort key: "<action>#<timestamp>"
+ACTION_LOG_BUCKET = 'all'
 
 # DynamoDB tables
 action_log_table = dynamodb.Table(ACTION_LOG_TABLE)
 confirmation_table = dynamodb.Table(CONFIRMATION_TABLE)
 
+# Static tags shared by every resource of a kind (never mutate; copy into a new list)
+_STATIC_AMI_TAGS = (
+    {'Key': 'BackupType', 'Value': 'AMI'},
+    {'Key': 'CreatedBy', 'Value': 'AI-Assistant'}
+)
+_STATIC_INSTANCE_TAGS = ({'Key': 'ManagedBy', 'Value': 'AI-Assistant'},)
+_STATIC_ALARM_TAGS = ({'Key': 'CreatedBy', 'Value': 'AI-Assistant'},)
+
+# Action log items waiting to be written; flushed in batches at handler exit
+_log_buffer = []
+_log_lock = threading.Lock()
+LOG_BATCH_SIZE = 25  # BatchWriteItem maximum
+LOG_COMPRESS_THRESHOLD = 1024  # Bytes; smaller JSON fields are stored as plain strings
+
+# Recent list_instance_amis results: (instance_id, since_date) -> (fetched_at, result)
+# Written from pool threads, so mutations go through _ami_cache_lock
+_ami_cache = {}
+_ami_cache_lock = threading.Lock()
+AMI_CACHE_TTL = 60  # seconds
+AMI_RECENT_DAYS = 7  # A backup newer than this counts as recent
+
 # Instance type pricing (approximate hourly rates in USD)
 INSTANCE_PRICING = {
     't3.nano': 0.0052, 't3.micro': 0.0104, 't3.small': 0.0208,
@@ -34,34 +134,62 @@ INSTANCE_PRICING = {
     'c5.large': 0.085, 'c5.xlarge': 0.17, 'c5.2xlarge': 0.34,
     'r5.large': 0.126, 'r5.xlarge': 0.252, 'r5.2xlarge': 0.504
 }
+HOURS_PER_MONTH = 730
+
+# Read-only views; monthly rates precomputed once at import
+INSTANCE_PRICING = types.MappingProxyType(INSTANCE_PRICING)
+INSTANCE_PRICING_MONTHLY = types.MappingProxyType(
+    {k: v * HOURS_PER_MONTH for k, v in INSTANCE_PRICING.items()}
+)
 
 # =====================================================
 # DYNAMODB LOGGING
 # =====================================================
 
+def _set_log_field(item, field, value):
+    """Store value as JSON, zstd-compressed into a Binary (flagged `<field>_z`) when large"""
+    data = _dumps(value)
+    if zstandard and len(data) > LOG_COMPRESS_THRESHOLD:
+        item[field] = zstandard.compress(data.encode(), 3)
+        item[f'{field}_z'] = True
+    else:
+        item[field] = data
+
+def _read_log_fields(item):
+    """Inflate fields written compressed by _set_log_field"""
+    for field in ('parameters', 'result'):
+        if zstandard and item.pop(f'{field}_z', False):
+            item[field] = zstandard.decompress(item[field].value).decode()
+    return item
+
 def log_action(action, parameters, status, result=None, error=None, user_query=None, user_email=None):
     """Log all actions to DynamoDB with user email"""
     try:
         log_id = str(uuid.uuid4())
-        timestamp = datetime.now().isoformat()
+        now = datetime.now()
+        timestamp = now.isoformat()
         
         item = {
             'log_id': log_id,
             'timestamp': timestamp,
+            'log_bucket': ACTION_LOG_BUCKET,
             'action': action,
-            'parameters': json.dumps(parameters),
+            'action_ts': f"{action}#{timestamp}",
             'status': status,  # 'pending', 'success', 'failed', 'requires_confirmation'
             'user_query': user_query or '',
-            'user_email': user_email or 'anonymous',
-            'ttl': int(time.time()) + (90 * 24 * 60 * 60)  # 90 days retention
+            'user_email': user_email or CURRENT_USER_EMAIL.get(),
+            'ttl': int(now.timestamp()) + (90 * 24 * 60 * 60)  # 90 days retention
         }
         
+        _set_log_field(item, 'parameters', parameters)
         if result:
-            item['result'] = json.dumps(result)
+            _set_log_field(item, 'result', result)
         if error:
             item['error'] = str(error)
         
-        action_log_table.put_item(Item=item)
+        _log_buffer.append(item)
+        if len(_log_buffer) >= LOG_BATCH_SIZE:
+            flush_logs()
         
         return {'logged': True, 'log_id': log_id}
     
@@ -69,52 +197,115 @@ def log_action(action, parameters, status, result=None, error=None, user_query=N
         print(f"Error logging action: {e}")
         return {'logged': False, 'error': str(e)}
 
+def flush_logs(max_attempts=5):
+    """Write buffered action logs with BatchWriteItem, retrying unprocessed items"""
+    while _log_buffer:
+        with _log_lock:
+            batch = _log_buffer[:LOG_BATCH_SIZE]
+            del _log_buffer[:LOG_BATCH_SIZE]
+        if not batch:
+            break
+        
+        request_items = {ACTION_LOG_TABLE: [{'PutRequest': {'Item': item}} for item in batch]}
+        try:
+            for attempt in range(max_attempts):
+                response = dynamodb.batch_write_item(RequestItems=request_items)
+                request_items = response.get('UnprocessedItems')
+                if not request_items:
+                    break
+                time.sleep(0.05 * (2 ** attempt))  # Exponential backoff
+            else:
+                print(f"Dropped {len(request_items[ACTION_LOG_TABLE])} action logs after {max_attempts} attempts")
+        
+        except Exception as e:
+            print(f"Error flushing action logs: {e}")
+
 def get_action_logs(limit=50, action_filter=None):
-    """Retrieve recent action logs"""
+    """Retrieve recent action logs (newest first)"""
     try:
         params = {
-            'Limit': limit,
-            'ScanIndexForward': False  # Sort by timestamp descending
+            'IndexName': ACTION_LOG_INDEX,
+            'KeyConditionExpression': Key('log_bucket').eq(ACTION_LOG_BUCKET),
+            'ScanIndexForward': False,  # Sort by timestamp descending
+            'Limit': limit
         }
         
         if action_filter:
-            params['FilterExpression'] = 'action = :action'
-            params['ExpressionAttributeValues'] = {':action': action_filter}
-        
-        response = action_log_table.scan(**params)
+            # Key condition, not a filter: only matching items are read
+            params['IndexName'] = ACTION_LOG_ACTION_INDEX
+            params['KeyConditionExpression'] = (
+                Key('log_bucket').eq(ACTION_LOG_BUCKET) & Key('action_ts').begins_with(f"{action_filter}#")
+            )
         
-        items = response.get('Items', [])
+        response = action_log_table.query(**params)
         
-        # Sort by timestamp
-        items.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        items = [_read_log_fields(item) for item in response.get('Items', [])]
         
         return {
             'success': True,
-            'logs': items[:limit],
+            'logs': items,
             'count': len(items)
         }
     
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+# =====================================================
+# AWS CALL WRAPPER
+# =====================================================
+
+# Transient throttling codes worth retrying (on top of botocore's own retries)
+_RETRYABLE_ERRORS = frozenset({
+    'Throttling', 'ThrottlingException', 'RequestLimitExceeded', 'ProvisionedThroughputExceededException'
+})
+
+# action/log_params: failure is logged as `action` with those named arguments
+# retry=False: for functions that consume a confirmation token (a retry would re-verify it)
+def _awscall(action=None, *log_params, retry=True, attempts=3):
+    """Return ClientError as {'success': False, 'error': ...}, retrying throttling with backoff"""
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return fn(*args, **kwargs)
+                except ClientError as e:
+                    code = e.response.get('Error', {}).get('Code')
+                    if retry and code in _RETRYABLE_ERRORS and attempt < attempts - 1:
+                        time.sleep(0.1 * (2 ** attempt) * (1 + random.random()))  # Backoff with jitter
+                        continue
+                    
+                    if action:
+                        arguments = signature.bind(*args, **kwargs).arguments
+                        log_action(action, {name: arguments.get(name) for name in log_params}, 'failed',
+                                   error=str(e))
+                    return {'success': False, 'error': str(e)}
+        
+        return wrapper
+    return decorator
+
 # =====================================================
 # CONFIRMATION SYSTEM (DynamoDB)
 # =====================================================
 
 def generate_confirmation_token(action, parameters):
     """Generate unique confirmation token stored in DynamoDB"""
-    data = f"{action}:{json.dumps(parameters)}:{time.time()}"
-    token = hashlib.sha256(data.encode()).hexdigest()[:12].upper()
+    token = secrets.token_hex(6).upper()
     
     try:
+        now = datetime.now()
+        expires_at = int(now.timestamp() + 300)  # 5 minutes
+        
         confirmation_table.put_item(
             Item={
                 'token': token,
                 'action': action,
-                'parameters': json.dumps(parameters),
-                'created_at': datetime.now().isoformat(),
-                'expires_at': int(time.time() + 300),  # 5 minutes
-                'ttl': int(time.time() + 300)
+                'parameters': _dumps(parameters),
+                'created_at': now.isoformat(),
+                'expires_at': expires_at,
+                'ttl': expires_at
             }
         )
         
@@ -124,769 +315,887 @@ def generate_confirmation_token(action, parameters):
         print(f"Error creating confirmation token: {e}")
         return None
 
+# Tokens are 12 uppercase hex characters (secrets.token_hex(6))
+_TOKEN_RE = re.compile(r'[0-9A-F]{12}')
+
 def verify_confirmation_token(token):
     """Verify and consume confirmation token from DynamoDB"""
+    token = (token or '').strip().upper()
+    if not _TOKEN_RE.fullmatch(token):
+        return {'valid': False, 'error': 'Invalid confirmation token'}
+    
     try:
-        response = confirmation_table.get_item(Key={'token': token})
-        
-        if 'Item' not in response:
-            return {'valid': False, 'error': 'Invalid confirmation token'}
-        
-        token_data = response['Item']
+        # Delete-if-unexpired consumes the token atomically in one round-trip
+        response = confirmation_table.delete_item(
+            Key={'token': token},
+            ConditionExpression=Attr('expires_at').gt(int(time.time())),
+            ReturnValues='ALL_OLD'
+        )
         
-        # Check expiration
-        if int(time.time()) > int(token_data['expires_at']):
-            confirmation_table.delete_item(Key={'token': token})
-            return {'valid': False, 'error': 'Token expired (5 min limit)'}
+        token_data = response['Attributes']
         
         # Get action data
         action = token_data['action']
-        parameters = json.loads(token_data['parameters'])
-        
-        # Delete token (one-time use)
-        confirmation_table.delete_item(Key={'token': token})
+        parameters = _loads(token_data['parameters'])
         
         return {'valid': True, 'action': action, 'parameters': parameters}
     
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return {'valid': False, 'error': 'Invalid or expired confirmation token (5 min limit)'}
+        return {'valid': False, 'error': str(e)}
+    
     except Exception as e:
         return {'valid': False, 'error': str(e)}
 
+@functools.lru_cache(maxsize=64)
+def _budget_for(instance_type):
+    """(allowed, hourly_cost, monthly_cost) for an instance type; pricing and limit are fixed at import"""
+    hourly_cost = INSTANCE_PRICING.get(instance_type, 0)
+    return hourly_cost <= MAX_INSTANCE_COST_PER_HOUR, hourly_cost, INSTANCE_PRICING_MONTHLY.get(instance_type, 0)
+
 def check_budget_limits(instance_type):
     """Check if instance type is within budget limits"""
-    hourly_cost = INSTANCE_PRICING.get(instance_type, 0)
+    allowed, hourly_cost, monthly_cost = _budget_for(instance_type)
     
-    if hourly_cost > MAX_INSTANCE_COST_PER_HOUR:
+    if not allowed:
         return {
             'allowed': False,
             'reason': f'Instance type exceeds budget limit',
             'hourly_cost': hourly_cost,
             'limit': MAX_INSTANCE_COST_PER_HOUR,
-            'monthly_cost': hourly_cost * 730
+            'monthly_cost': monthly_cost
         }
     
     return {
         'allowed': True,
         'hourly_cost': hourly_cost,
-        'monthly_cost': hourly_cost * 730
+        'monthly_cost': monthly_cost
     }
 
 # =====================================================
 # AMI BACKUP OPERATIONS
 # =====================================================
 
-def list_instance_amis(instance_id):
-    """List all AMIs created from an instance"""
-    try:
-        response = ec2_client.describe_images(
-            Filters=[
-                {'Name': 'tag:SourceInstanceId', 'Values': [instance_id]}
-            ],
-            Owners=['self']
-        )
-        
-        amis = []
-        for image in response['Images']:
-            ami_info = {
-                'ImageId': image['ImageId'],
-                'Name': image.get('Name', 'N/A'),
-                'State': image['State'],
-                'CreationDate': image['CreationDate'],
-                'Description': image.get('Description', ''),
-                'Tags': {tag['Key']: tag['Value'] for tag in image.get('Tags', [])}
-            }
-            amis.append(ami_info)
-        
-        # Sort by creation date (newest first)
+@functools.lru_cache(maxsize=256)
+def _parse_iso8601(value):
+    """Parse an EC2 timestamp (e.g. 2024-01-01T12:00:00.000Z) into an aware UTC datetime"""
+    if _parse_datetime:
+        return _parse_datetime(value)
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=timezone.utc)
+
+def _project_image(image):
+    """Trimmed view of a DescribeImages image"""
+    return {
+        'ImageId': image['ImageId'],
+        'Name': image.get('Name', 'N/A'),
+        'State': image['State'],
+        'CreationDate': image['CreationDate'],
+        'Description': image.get('Description', ''),
+        'Tags': {tag['Key']: tag['Value'] for tag in image.get('Tags', [])}
+    }
+
+def _cache_amis(cache_key, result, fetched_at):
+    """Store a list_instance_amis result, dropping expired entries"""
+    with _ami_cache_lock:
+        for key, (cached_at, _) in list(_ami_cache.items()):
+            if fetched_at - cached_at >= AMI_CACHE_TTL:
+                _ami_cache.pop(key, None)
+        _ami_cache[cache_key] = (fetched_at, result)
+
+def _invalidate_amis(instance_id):
+    """Forget every cached AMI listing for an instance"""
+    with _ami_cache_lock:
+        for key in list(_ami_cache):
+            if key[0] == instance_id:
+                _ami_cache.pop(key, None)
+
+@_awscall()
+def list_instance_amis(instance_id, since=None):
+    """List AMIs created from an instance, optionally only those created on or after `since` (UTC day)"""
+    since_date = since.date() if since else None
+    cache_key = (instance_id, since_date)
+    cached = _ami_cache.get(cache_key)
+    if cached and time.time() - cached[0] < AMI_CACHE_TTL:
+        return cached[1]
+    
+    filters = [
+        {'Name': 'tag:SourceInstanceId', 'Values': [instance_id]}
+    ]
+    
+    if since_date:
+        # creation-date matches by prefix, so one wildcard value per day
+        days = (datetime.now(timezone.utc).date() - since_date).days
+        filters.append({
+            'Name': 'creation-date',
+            'Values': [f"{since_date + timedelta(days=i)}*" for i in range(days + 1)]
+        })
+    
+    response = ec2_client.describe_images(
+        Filters=filters,
+        Owners=['self']
+    )
+    
+    amis = [_project_image(image) for image in response['Images']]
+    
+    # Sort by creation date (newest first)
+    amis.sort(key=lambda x: x['CreationDate'], reverse=True)
+    
+    result = {'success': True, 'amis': amis, 'count': len(amis)}
+    _cache_amis(cache_key, result, time.time())
+    
+    return result
+
+@_awscall()
+def list_amis_by_instance(instance_ids):
+    """List AMIs for several instances with one DescribeImages call"""
+    response = ec2_client.describe_images(
+        Filters=[
+            {'Name': 'tag:SourceInstanceId', 'Values': list(instance_ids)}
+        ],
+        Owners=['self']
+    )
+    
+    grouped = {instance_id: [] for instance_id in instance_ids}
+    for image in response['Images']:
+        ami_info = _project_image(image)
+        source_instance_id = ami_info['Tags'].get('SourceInstanceId')
+        if source_instance_id in grouped:
+            grouped[source_instance_id].append(ami_info)
+    
+    # Same shape as list_instance_amis(instance_id), and primes its cache
+    results = {}
+    fetched_at = time.time()
+    for instance_id, amis in grouped.items():
         amis.sort(key=lambda x: x['CreationDate'], reverse=True)
-        
-        return {'success': True, 'amis': amis, 'count': len(amis)}
+        results[instance_id] = {'success': True, 'amis': amis, 'count': len(amis)}
+        _cache_amis((instance_id, None), results[instance_id], fetched_at)
     
-    except ClientError as e:
-        return {'success': False, 'error': str(e)}
+    return {'success': True, 'results': results}
 
-def create_ami_backup(instance_id, ami_name=None, description=None, no_reboot=True):
-    """Create AMI backup of an instance"""
-    try:
-        # Get instance details
+@_awscall('create_ami_backup', 'instance_id')
+def create_ami_backup(instance_id, ami_name=None, description=None, no_reboot=True, instance=None):
+    """Create AMI backup of an instance (pass `instance` if already described)"""
+    # Get instance details
+    if instance is None:
         instance_response = ec2_client.describe_instances(InstanceIds=[instance_id])
         instance = instance_response['Reservations'][0]['Instances'][0]
-        
-        instance_name = 'Unknown'
-        for tag in instance.get('Tags', []):
-            if tag['Key'] == 'Name':
-                instance_name = tag['Value']
-                break
-        
-        # Generate AMI name
-        timestamp = datetime.now().strftime('%Y-%m-%d-%H%M%S')
-        if not ami_name:
-            ami_name = f"{instance_name}-backup-{timestamp}"
-        
-        if not description:
-            description = f"AMI backup of {instance_name} ({instance_id}) created on {timestamp}"
-        
-        # Create AMI
-        response = ec2_client.create_image(
-            InstanceId=instance_id,
-            Name=ami_name,
-            Description=description,
-            NoReboot=no_reboot,
-            TagSpecifications=[
-                {
-                    'ResourceType': 'image',
-                    'Tags': [
-                        {'Key': 'Name', 'Value': ami_name},
-                        {'Key': 'SourceInstanceId', 'Value': instance_id},
-                        {'Key': 'SourceInstanceName', 'Value': instance_name},
-                        {'Key': 'BackupType', 'Value': 'AMI'},
-                        {'Key': 'CreatedBy', 'Value': 'AI-Assistant'},
-                        {'Key': 'CreatedAt', 'Value': timestamp}
-                    ]
-                }
-            ]
-        )
-        
-        ami_id = response['ImageId']
-        
-        # Log the action
-        log_action('create_ami_backup', {'instance_id': instance_id}, 'success', 
-                  {'ami_id': ami_id, 'ami_name': ami_name})
-        
+    
+    instance_name = 'Unknown'
+    for tag in instance.get('Tags', []):
+        if tag['Key'] == 'Name':
+            instance_name = tag['Value']
+            break
+    
+    # Generate AMI name
+    timestamp = datetime.now().strftime('%Y-%m-%d-%H%M%S')
+    if not ami_name:
+        ami_name = f"{instance_name}-backup-{timestamp}"
+    
+    if not description:
+        description = f"AMI backup of {instance_name} ({instance_id}) created on {timestamp}"
+    
+    # Create AMI
+    response = ec2_client.create_image(
+        InstanceId=instance_id,
+        Name=ami_name,
+        Description=description,
+        NoReboot=no_reboot,
+        TagSpecifications=[
+            {
+                'ResourceType': 'image',
+                'Tags': [
+                    *_STATIC_AMI_TAGS,
+                    {'Key': 'Name', 'Value': ami_name},
+                    {'Key': 'SourceInstanceId', 'Value': instance_id},
+                    {'Key': 'SourceInstanceName', 'Value': instance_name},
+                    {'Key': 'CreatedAt', 'Value': timestamp}
+                ]
+            }
+        ]
+    )
+    
+    ami_id = response['ImageId']
+    _invalidate_amis(instance_id)
+    
+    # Log the action
+    log_action('create_ami_backup', {'instance_id': instance_id}, 'success', 
+              {'ami_id': ami_id, 'ami_name': ami_name})
+    
+    return {
+        'success': True,
+        'ami_id': ami_id,
+        'ami_name': ami_name,
+        'instance_id': instance_id,
+        'instance_name': instance_name,
+        'no_reboot': no_reboot,
+        'message': f'AMI backup {ami_id} created successfully'
+    }
+
+@_awscall('create_ami_backups_bulk', 'instance_ids')
+def create_ami_backups_bulk(instance_ids, no_reboot=True):
+    """Create AMI backups for several instances concurrently"""
+    if not instance_ids:
+        return {'success': False, 'error': 'No instance IDs provided'}
+    
+    # One describe for all instances; each backup reuses its instance dict. A filter
+    # (unlike InstanceIds) skips unknown IDs, which then fail individually below
+    response = ec2_client.describe_instances(
+        Filters=[{'Name': 'instance-id', 'Values': list(instance_ids)}]
+    )
+    instances = {
+        instance['InstanceId']: instance
+        for reservation in response['Reservations']
+        for instance in reservation['Instances']
+    }
+    
+    # Concurrency is bounded by the shared pool size
+    futures = [
+        _submit(create_ami_backup, instance_id, no_reboot=no_reboot, instance=instances.get(instance_id))
+        for instance_id in instance_ids
+    ]
+    results = [future.result() for future in futures]
+    succeeded = sum(1 for result in results if result['success'])
+    
+    return {
+        'success': succeeded == len(results),
+        'results': results,
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'message': f'{succeeded} of {len(results)} AMI backups started'
+    }
+
+@_awscall()
+def check_ami_backup_status(instance_id, amis_result=None):
+    """Check if instance has recent AMI backups (amis_result: optional prefetched recent listing)"""
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=AMI_RECENT_DAYS)
+    
+    if amis_result is None:
+        amis_result = list_instance_amis(instance_id, since=cutoff_date)
+    
+    if not amis_result['success']:
+        return amis_result
+    
+    # Check for recent backups (within last 7 days)
+    recent_amis = []
+    
+    for ami in amis_result['amis']:
+        # AMIs are sorted newest first, so the first old one ends the run
+        if _parse_iso8601(ami['CreationDate']) <= cutoff_date:
+            break
+        recent_amis.append(ami)
+    
+    if recent_amis:
+        latest = recent_amis[0]
         return {
             'success': True,
-            'ami_id': ami_id,
-            'ami_name': ami_name,
-            'instance_id': instance_id,
-            'instance_name': instance_name,
-            'no_reboot': no_reboot,
-            'message': f'AMI backup {ami_id} created successfully'
+            'has_backup': True,
+            'has_recent_backup': True,
+            'latest_ami': latest,
+            'recent_amis_count': len(recent_amis),
+            'message': f'Latest AMI backup: {latest["ImageId"]} from {latest["CreationDate"]}'
         }
     
-    except ClientError as e:
-        log_action('create_ami_backup', {'instance_id': instance_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
-
-def check_ami_backup_status(instance_id):
-    """Check if instance has recent AMI backups"""
-    try:
-        amis_result = list_instance_amis(instance_id)
-        
-        if not amis_result['success']:
-            return amis_result
-        
-        amis = amis_result['amis']
-        
-        if not amis:
-            return {
-                'success': True,
-                'has_backup': False,
-                'message': 'No AMI backups found for this instance',
-                'recommendation': 'Create an AMI backup before proceeding'
-            }
-        
-        # Check for recent backups (within last 7 days)
-        recent_amis = []
-        cutoff_date = datetime.now() - timedelta(days=7)
-        
-        for ami in amis:
-            ami_date = datetime.fromisoformat(ami['CreationDate'].replace('Z', '+00:00'))
-            if ami_date.replace(tzinfo=None) > cutoff_date:
-                recent_amis.append(ami)
-        
-        if recent_amis:
-            latest = recent_amis[0]
-            return {
-                'success': True,
-                'has_backup': True,
-                'has_recent_backup': True,
-                'latest_ami': latest,
-                'recent_amis_count': len(recent_amis),
-                'total_amis_count': len(amis),
-                'message': f'Latest AMI backup: {latest["ImageId"]} from {latest["CreationDate"]}'
-            }
-        else:
-            latest = amis[0]
-            return {
-                'success': True,
-                'has_backup': True,
-                'has_recent_backup': False,
-                'latest_ami': latest,
-                'total_amis_count': len(amis),
-                'message': f'Latest AMI backup is older than 7 days: {latest["CreationDate"]}',
-                'recommendation': 'Consider creating a fresh AMI backup'
-            }
+    # Nothing recent: only now is the full listing (and total_amis_count) worth a second call
+    all_amis_result = list_instance_amis(instance_id)
+    if not all_amis_result['success']:
+        return all_amis_result
     
-    except ClientError as e:
-        return {'success': False, 'error': str(e)}
+    amis = all_amis_result['amis']
+    
+    if not amis:
+        return {
+            'success': True,
+            'has_backup': False,
+            'message': 'No AMI backups found for this instance',
+            'recommendation': 'Create an AMI backup before proceeding'
+        }
+    
+    latest = amis[0]
+    return {
+        'success': True,
+        'has_backup': True,
+        'has_recent_backup': False,
+        'latest_ami': latest,
+        'total_amis_count': len(amis),
+        'message': f'Latest AMI backup is older than 7 days: {latest["CreationDate"]}',
+        'recommendation': 'Consider creating a fresh AMI backup'
+    }
 
 # =====================================================
 # CLOUDWATCH ALARMS
 # =====================================================
 
+@_awscall('create_cpu_alarm', 'instance_id')
 def create_cpu_alarm(instance_id, threshold=80, alarm_name=None, sns_topic_arn=None):
     """Create CPU utilization alarm for instance"""
-    try:
-        if not alarm_name:
-            alarm_name = f"{instance_id}-high-cpu"
-        
-        alarm_actions = [sns_topic_arn] if sns_topic_arn else []
-        
-        cloudwatch_client.put_metric_alarm(
-            AlarmName=alarm_name,
-            ComparisonOperator='GreaterThanThreshold',
-            EvaluationPeriods=2,
-            MetricName='CPUUtilization',
-            Namespace='AWS/EC2',
-            Period=300,
-            Statistic='Average',
-            Threshold=threshold,
-            ActionsEnabled=True,
-            AlarmActions=alarm_actions,
-            AlarmDescription=f'Alert when CPU exceeds {threshold}% for {instance_id}',
-            Dimensions=[
-                {
-                    'Name': 'InstanceId',
-                    'Value': instance_id
-                }
-            ],
-            Tags=[
-                {'Key': 'InstanceId', 'Value': instance_id},
-                {'Key': 'CreatedBy', 'Value': 'AI-Assistant'}
-            ]
-        )
-        
-        log_action('create_cpu_alarm', {'instance_id': instance_id, 'threshold': threshold}, 
-                  'success', {'alarm_name': alarm_name})
-        
-        return {
-            'success': True,
-            'alarm_name': alarm_name,
-            'threshold': threshold,
-            'instance_id': instance_id,
-            'message': f'CPU alarm created: {alarm_name}'
-        }
+    if not alarm_name:
+        alarm_name = f"{instance_id}-high-cpu"
     
-    except ClientError as e:
-        log_action('create_cpu_alarm', {'instance_id': instance_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    alarm_actions = [sns_topic_arn] if sns_topic_arn else []
+    
+    cloudwatch_client.put_metric_alarm(
+        AlarmName=alarm_name,
+        ComparisonOperator='GreaterThanThreshold',
+        EvaluationPeriods=2,
+        MetricName='CPUUtilization',
+        Namespace='AWS/EC2',
+        Period=300,
+        Statistic='Average',
+        Threshold=threshold,
+        ActionsEnabled=True,
+        AlarmActions=alarm_actions,
+        AlarmDescription=f'Alert when CPU exceeds {threshold}% for {instance_id}',
+        Dimensions=[
+            {
+                'Name': 'InstanceId',
+                'Value': instance_id
+            }
+        ],
+        Tags=[
+            *_STATIC_ALARM_TAGS,
+            {'Key': 'InstanceId', 'Value': instance_id}
+        ]
+    )
+    
+    log_action('create_cpu_alarm', {'instance_id': instance_id, 'threshold': threshold}, 
+              'success', {'alarm_name': alarm_name})
+    
+    return {
+        'success': True,
+        'alarm_name': alarm_name,
+        'threshold': threshold,
+        'instance_id': instance_id,
+        'message': f'CPU alarm created: {alarm_name}'
+    }
 
+@_awscall('create_status_alarm', 'instance_id')
 def create_status_check_alarm(instance_id, alarm_name=None, sns_topic_arn=None):
     """Create status check alarm for instance"""
-    try:
-        if not alarm_name:
-            alarm_name = f"{instance_id}-status-check-failed"
-        
-        alarm_actions = [sns_topic_arn] if sns_topic_arn else []
-        
-        cloudwatch_client.put_metric_alarm(
-            AlarmName=alarm_name,
-            ComparisonOperator='GreaterThanThreshold',
-            EvaluationPeriods=2,
-            MetricName='StatusCheckFailed',
-            Namespace='AWS/EC2',
-            Period=60,
-            Statistic='Maximum',
-            Threshold=0,
-            ActionsEnabled=True,
-            AlarmActions=alarm_actions,
-            AlarmDescription=f'Alert when status check fails for {instance_id}',
-            Dimensions=[
-                {
-                    'Name': 'InstanceId',
-                    'Value': instance_id
-                }
-            ],
-            Tags=[
-                {'Key': 'InstanceId', 'Value': instance_id},
-                {'Key': 'CreatedBy', 'Value': 'AI-Assistant'}
-            ]
-        )
-        
-        log_action('create_status_alarm', {'instance_id': instance_id}, 'success', 
-                  {'alarm_name': alarm_name})
-        
-        return {
-            'success': True,
-            'alarm_name': alarm_name,
-            'instance_id': instance_id,
-            'message': f'Status check alarm created: {alarm_name}'
-        }
+    if not alarm_name:
+        alarm_name = f"{instance_id}-status-check-failed"
     
-    except ClientError as e:
-        log_action('create_status_alarm', {'instance_id': instance_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    alarm_actions = [sns_topic_arn] if sns_topic_arn else []
+    
+    cloudwatch_client.put_metric_alarm(
+        AlarmName=alarm_name,
+        ComparisonOperator='GreaterThanThreshold',
+        EvaluationPeriods=2,
+        MetricName='StatusCheckFailed',
+        Namespace='AWS/EC2',
+        Period=60,
+        Statistic='Maximum',
+        Threshold=0,
+        ActionsEnabled=True,
+        AlarmActions=alarm_actions,
+        AlarmDescription=f'Alert when status check fails for {instance_id}',
+        Dimensions=[
+            {
+                'Name': 'InstanceId',
+                'Value': instance_id
+            }
+        ],
+        Tags=[
+            *_STATIC_ALARM_TAGS,
+            {'Key': 'InstanceId', 'Value': instance_id}
+        ]
+    )
+    
+    log_action('create_status_alarm', {'instance_id': instance_id}, 'success', 
+              {'alarm_name': alarm_name})
+    
+    return {
+        'success': True,
+        'alarm_name': alarm_name,
+        'instance_id': instance_id,
+        'message': f'Status check alarm created: {alarm_name}'
+    }
 
-def list_instance_alarms(instance_id):
-    """List all alarms for an instance"""
-    try:
-        response = cloudwatch_client.describe_alarms(
-            AlarmNamePrefix=instance_id
-        )
-        
-        alarms = []
-        for alarm in response['MetricAlarms']:
+@_awscall()
+def list_instance_alarms(instance_id, limit=100):
+    """List alarms for an instance (at most `limit`)"""
+    paginator = cloudwatch_client.get_paginator('describe_alarms')
+    pages = paginator.paginate(
+        AlarmNamePrefix=instance_id,
+        AlarmTypes=['MetricAlarm'],
+        PaginationConfig={'MaxItems': limit}
+    )
+    
+    alarms = []
+    for page in pages:
+        for alarm in page['MetricAlarms']:
             alarm_info = {
                 'AlarmName': alarm['AlarmName'],
                 'MetricName': alarm['MetricName'],
                 'Threshold': alarm['Threshold'],
                 'State': alarm['StateValue'],
-                'ActionsEnabled': alarm['ActionsEnabled'],
                 'AlarmDescription': alarm.get('AlarmDescription', '')
             }
             alarms.append(alarm_info)
-        
-        return {'success': True, 'alarms': alarms, 'count': len(alarms)}
     
-    except ClientError as e:
-        return {'success': False, 'error': str(e)}
+    return {'success': True, 'alarms': alarms, 'count': len(alarms)}
 
+@_awscall('delete_alarm', 'alarm_name')
 def delete_alarm(alarm_name):
     """Delete a CloudWatch alarm"""
-    try:
-        cloudwatch_client.delete_alarms(AlarmNames=[alarm_name])
-        
-        log_action('delete_alarm', {'alarm_name': alarm_name}, 'success')
-        
-        return {
-            'success': True,
-            'alarm_name': alarm_name,
-            'message': f'Alarm {alarm_name} deleted'
-        }
+    cloudwatch_client.delete_alarms(AlarmNames=[alarm_name])
     
-    except ClientError as e:
-        log_action('delete_alarm', {'alarm_name': alarm_name}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    log_action('delete_alarm', {'alarm_name': alarm_name}, 'success')
+    
+    return {
+        'success': True,
+        'alarm_name': alarm_name,
+        'message': f'Alarm {alarm_name} deleted'
+    }
 
 # =====================================================
 # EC2 INSTANCE OPERATIONS
 # =====================================================
 
-def list_ec2_instances(filters=None):
-    """List all EC2 instances"""
-    try:
-        params = {}
-        if filters:
-            params['Filters'] = filters
-        
-        response = ec2_client.describe_instances(**params)
-        
-        instances = []
-        for reservation in response['Reservations']:
+# Server-side state filters keep Describe* responses small
+LIVE_INSTANCE_STATES = ['pending', 'running', 'stopping', 'stopped']
+LISTED_VOLUME_STATES = ['in-use', 'available']
+
+def _project_instance(instance, now):
+    """Trimmed view of a DescribeInstances instance"""
+    instance_type = instance['InstanceType']
+    launch_time = instance['LaunchTime']
+    
+    return {
+        'InstanceId': instance['InstanceId'],
+        'InstanceType': instance_type,
+        'State': instance['State']['Name'],
+        'LaunchTime': launch_time.isoformat(),
+        'UptimeDays': (now - launch_time.replace(tzinfo=None)).days,
+        'PrivateIpAddress': instance.get('PrivateIpAddress', 'N/A'),
+        'PublicIpAddress': instance.get('PublicIpAddress', 'N/A'),
+        'AvailabilityZone': instance['Placement']['AvailabilityZone'],
+        'Tags': {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])},
+        'HourlyCost': INSTANCE_PRICING.get(instance_type, 0),
+        'MonthlyCost': INSTANCE_PRICING_MONTHLY.get(instance_type, 0)
+    }
+
+@_awscall()
+def list_ec2_instances(filters=None, limit=200):
+    """List EC2 instances (at most `limit`; excludes terminated ones unless a state filter is given)"""
+    filters = list(filters or [])
+    if not any(f['Name'] == 'instance-state-name' for f in filters):
+        filters.append({'Name': 'instance-state-name', 'Values': LIVE_INSTANCE_STATES})
+    params = {'Filters': filters}
+    
+    paginator = ec2_client.get_paginator('describe_instances')
+    pages = paginator.paginate(PaginationConfig={'MaxItems': limit, 'PageSize': 100}, **params)
+    
+    instances = []
+    now = datetime.now()
+    for page in pages:
+        for reservation in page['Reservations']:
             for instance in reservation['Instances']:
-                launch_time = instance['LaunchTime'].replace(tzinfo=None)
-                uptime_days = (datetime.now() - launch_time).days
-                
-                instance_info = {
-                    'InstanceId': instance['InstanceId'],
-                    'InstanceType': instance['InstanceType'],
-                    'State': instance['State']['Name'],
-                    'LaunchTime': instance['LaunchTime'].isoformat(),
-                    'UptimeDays': uptime_days,
-                    'PrivateIpAddress': instance.get('PrivateIpAddress', 'N/A'),
-                    'PublicIpAddress': instance.get('PublicIpAddress', 'N/A'),
-                    'AvailabilityZone': instance['Placement']['AvailabilityZone'],
-                    'Tags': {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])},
-                    'HourlyCost': INSTANCE_PRICING.get(instance['InstanceType'], 0),
-                    'MonthlyCost': INSTANCE_PRICING.get(instance['InstanceType'], 0) * 730
-                }
-                instances.append(instance_info)
-        
-        return {'success': True, 'instances': instances, 'count': len(instances)}
+                # MaxItems counts reservations, so one past `limit` proves more remain
+                if len(instances) == limit:
+                    return {'success': True, 'instances': instances, 'count': len(instances), 'truncated': True}
+                instances.append(_project_instance(instance, now))
     
-    except ClientError as e:
-        return {'success': False, 'error': str(e)}
+    result = {'success': True, 'instances': instances, 'count': len(instances)}
+    # The paginator leaves a resume token only when it stopped at MaxItems with pages left
+    if pages.resume_token:
+        result['truncated'] = True
+    return result
 
+@_awscall('launch_instance', 'ami_id', 'instance_type')
 def launch_ec2_instance(ami_id, instance_type, key_name=None, subnet_id=None, security_group_ids=None, tags=None, dry_run=False):
     """Launch a new EC2 instance"""
-    try:
-        user_email = os.environ.get('CURRENT_USER_EMAIL', 'anonymous')
-        budget_check = check_budget_limits(instance_type)
-        if not budget_check['allowed']:
-            log_action('launch_instance', {'instance_type': instance_type}, 'failed', 
-                      error=budget_check['reason'], user_email=user_email)
-            return {'success': False, 'error': budget_check['reason'], 'details': budget_check}
-        
-        if dry_run:
-            return {
-                'success': True,
-                'dry_run': True,
-                'message': 'Dry run successful',
-                'estimated_cost': budget_check
-            }
-        
-        params = {
-            'ImageId': ami_id,
-            'InstanceType': instance_type,
-            'MinCount': 1,
-            'MaxCount': 1,
-            'TagSpecifications': [
-                {
-                    'ResourceType': 'instance',
-                    'Tags': [
-                        {'Key': 'ManagedBy', 'Value': 'AI-Assistant'},
-                        {'Key': 'LaunchedBy', 'Value': user_email},
-                        {'Key': 'LaunchedAt', 'Value': datetime.now().isoformat()}
-                    ]
-                }
-            ]
-        }
-        
-        if key_name:
-            params['KeyName'] = key_name
-        if subnet_id:
-            params['SubnetId'] = subnet_id
-        if security_group_ids:
-            params['SecurityGroupIds'] = security_group_ids
-        if tags:
-            params['TagSpecifications'][0]['Tags'].extend([{'Key': k, 'Value': v} for k, v in tags.items()])
-        
-        response = ec2_client.run_instances(**params)
-        instance = response['Instances'][0]
-        
-        log_action('launch_instance', params, 'success', {'instance_id': instance['InstanceId']}, user_email=user_email)
-        
+    user_email = CURRENT_USER_EMAIL.get()
+    budget_check = check_budget_limits(instance_type)
+    if not budget_check['allowed']:
+        log_action('launch_instance', {'instance_type': instance_type}, 'failed', 
+                  error=budget_check['reason'], user_email=user_email)
+        return {'success': False, 'error': budget_check['reason'], 'details': budget_check}
+    
+    if dry_run:
         return {
             'success': True,
-            'instance_id': instance['InstanceId'],
-            'instance_type': instance['InstanceType'],
-            'state': instance['State']['Name'],
-            'cost_estimate': budget_check,
-            'message': f"Instance {instance['InstanceId']} launched successfully"
+            'dry_run': True,
+            'message': 'Dry run successful',
+            'estimated_cost': budget_check
         }
     
-    except ClientError as e:
-        log_action('launch_instance', {'ami_id': ami_id, 'instance_type': instance_type}, 
-                  'failed', error=str(e), user_email=os.environ.get('CURRENT_USER_EMAIL', 'anonymous'))
-        return {'success': False, 'error': str(e)}
+    params = {
+        'ImageId': ami_id,
+        'InstanceType': instance_type,
+        'MinCount': 1,
+        'MaxCount': 1,
+        'TagSpecifications': [
+            {
+                'ResourceType': 'instance',
+                'Tags': [
+                    *_STATIC_INSTANCE_TAGS,
+                    {'Key': 'LaunchedBy', 'Value': user_email},
+                    {'Key': 'LaunchedAt', 'Value': datetime.now().isoformat()}
+                ]
+            }
+        ]
+    }
+    
+    if key_name:
+        params['KeyName'] = key_name
+    if subnet_id:
+        params['SubnetId'] = subnet_id
+    if security_group_ids:
+        params['SecurityGroupIds'] = security_group_ids
+    if tags:
+        params['TagSpecifications'][0]['Tags'].extend([{'Key': k, 'Value': v} for k, v in tags.items()])
+    
+    response = ec2_client.run_instances(**params)
+    instance = response['Instances'][0]
+    
+    log_action('launch_instance', params, 'success', {'instance_id': instance['InstanceId']}, user_email=user_email)
+    
+    return {
+        'success': True,
+        'instance_id': instance['InstanceId'],
+        'instance_type': instance['InstanceType'],
+        'state': instance['State']['Name'],
+        'cost_estimate': budget_check,
+        'message': f"Instance {instance['InstanceId']} launched successfully"
+    }
 
+@_awscall('terminate_instance', 'instance_id', retry=False)
 def terminate_ec2_instance(instance_id, confirmation_token=None, skip_backup=False):
     """Terminate instance with AMI backup check"""
-    try:
-        response = ec2_client.describe_instances(InstanceIds=[instance_id])
-        if not response['Reservations']:
-            return {'success': False, 'error': f"Instance {instance_id} not found"}
-        
-        instance = response['Reservations'][0]['Instances'][0]
-        instance_name = next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), 'Unknown')
-        
-        # Check AMI backup
-        if not skip_backup:
-            backup_status = check_ami_backup_status(instance_id)
-            
-            if backup_status['success'] and not backup_status.get('has_recent_backup', False):
-                log_action('terminate_instance', {'instance_id': instance_id}, 
-                          'requires_confirmation', {'reason': 'no_recent_backup'})
-                return {
-                    'success': False,
-                    'requires_confirmation': True,
-                    'backup_status': backup_status,
-                    'message': 'No recent AMI backup. Create AMI first or confirm to proceed.',
-                    'recommendation': f"Run: 'Create AMI backup for {instance_id}'"
-                }
+    # Fetch AMIs concurrently with the instance lookup; neither depends on the other
+    amis_future = None
+    if not skip_backup:
+        since = datetime.now(timezone.utc) - timedelta(days=AMI_RECENT_DAYS)
+        amis_future = _submit(list_instance_amis, instance_id, since)
+    
+    response = ec2_client.describe_instances(InstanceIds=[instance_id])
+    if not response['Reservations']:
+        return {'success': False, 'error': f"Instance {instance_id} not found"}
+    
+    instance = response['Reservations'][0]['Instances'][0]
+    instance_name = next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), 'Unknown')
+    
+    # Check AMI backup
+    if not skip_backup:
+        backup_status = check_ami_backup_status(instance_id, amis_future.result())
         
-        # Require confirmation
-        if not confirmation_token:
-            token = generate_confirmation_token('terminate_instance', {'instance_id': instance_id})
-            log_action('terminate_instance', {'instance_id': instance_id}, 'requires_confirmation')
-            
+        if backup_status['success'] and not backup_status.get('has_recent_backup', False):
+            log_action('terminate_instance', {'instance_id': instance_id}, 
+                      'requires_confirmation', {'reason': 'no_recent_backup'})
             return {
                 'success': False,
                 'requires_confirmation': True,
-                'confirmation_token': token,
-                'instance_details': {
-                    'instance_id': instance_id,
-                    'name': instance_name,
-                    'type': instance['InstanceType'],
-                    'state': instance['State']['Name']
-                },
-                'message': f"⚠️ DESTRUCTIVE: Terminating {instance_name}. Token: {token}"
+                'backup_status': backup_status,
+                'message': 'No recent AMI backup. Create AMI first or confirm to proceed.',
+                'recommendation': f"Run: 'Create AMI backup for {instance_id}'"
             }
-        
-        # Verify token
-        token_verify = verify_confirmation_token(confirmation_token)
-        if not token_verify['valid']:
-            return {'success': False, 'error': token_verify['error']}
-        
-        # Terminate
-        response = ec2_client.terminate_instances(InstanceIds=[instance_id])
-        current_state = response['TerminatingInstances'][0]['CurrentState']['Name']
-        
-        log_action('terminate_instance', {'instance_id': instance_id}, 'success')
+    
+    # Require confirmation
+    if not confirmation_token:
+        token = generate_confirmation_token('terminate_instance', {'instance_id': instance_id})
+        log_action('terminate_instance', {'instance_id': instance_id}, 'requires_confirmation')
         
         return {
-            'success': True,
-            'instance_id': instance_id,
-            'instance_name': instance_name,
-            'state': current_state,
-            'message': f"Instance {instance_id} termination initiated"
+            'success': False,
+            'requires_confirmation': True,
+            'confirmation_token': token,
+            'instance_details': {
+                'instance_id': instance_id,
+                'name': instance_name,
+                'type': instance['InstanceType'],
+                'state': instance['State']['Name']
+            },
+            'message': f"⚠️ DESTRUCTIVE: Terminating {instance_name}. Token: {token}"
         }
     
-    except ClientError as e:
-        log_action('terminate_instance', {'instance_id': instance_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    # Verify token
+    token_verify = verify_confirmation_token(confirmation_token)
+    if not token_verify['valid']:
+        return {'success': False, 'error': token_verify['error']}
+    
+    # Terminate
+    response = ec2_client.terminate_instances(InstanceIds=[instance_id])
+    current_state = response['TerminatingInstances'][0]['CurrentState']['Name']
+    
+    log_action('terminate_instance', {'instance_id': instance_id}, 'success')
+    
+    return {
+        'success': True,
+        'instance_id': instance_id,
+        'instance_name': instance_name,
+        'state': current_state,
+        'message': f"Instance {instance_id} termination initiated"
+    }
 
+@_awscall('stop_instance', 'instance_id')
 def stop_ec2_instance(instance_id):
     """Stop instance"""
-    try:
-        response = ec2_client.stop_instances(InstanceIds=[instance_id])
-        current_state = response['StoppingInstances'][0]['CurrentState']['Name']
-        
-        log_action('stop_instance', {'instance_id': instance_id}, 'success')
-        
-        return {
-            'success': True,
-            'instance_id': instance_id,
-            'state': current_state,
-            'message': f"Instance {instance_id} stopping"
-        }
+    response = ec2_client.stop_instances(InstanceIds=[instance_id])
+    current_state = response['StoppingInstances'][0]['CurrentState']['Name']
     
-    except ClientError as e:
-        log_action('stop_instance', {'instance_id': instance_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    log_action('stop_instance', {'instance_id': instance_id}, 'success')
+    
+    return {
+        'success': True,
+        'instance_id': instance_id,
+        'state': current_state,
+        'message': f"Instance {instance_id} stopping"
+    }
 
+@_awscall('start_instance', 'instance_id')
 def start_ec2_instance(instance_id):
     """Start instance"""
-    try:
-        response = ec2_client.start_instances(InstanceIds=[instance_id])
-        current_state = response['StartingInstances'][0]['CurrentState']['Name']
-        
-        log_action('start_instance', {'instance_id': instance_id}, 'success')
-        
-        return {
-            'success': True,
-            'instance_id': instance_id,
-            'state': current_state,
-            'message': f"Instance {instance_id} starting"
-        }
+    response = ec2_client.start_instances(InstanceIds=[instance_id])
+    current_state = response['StartingInstances'][0]['CurrentState']['Name']
     
-    except ClientError as e:
-        log_action('start_instance', {'instance_id': instance_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    log_action('start_instance', {'instance_id': instance_id}, 'success')
+    
+    return {
+        'success': True,
+        'instance_id': instance_id,
+        'state': current_state,
+        'message': f"Instance {instance_id} starting"
+    }
 
+@_awscall('change_instance_type', 'instance_id', retry=False)
 def change_instance_type(instance_id, new_instance_type, confirmation_token=None, create_backup=True):
     """Change instance type with AMI backup"""
-    try:
-        budget_check = check_budget_limits(new_instance_type)
-        if not budget_check['allowed']:
-            return {'success': False, 'error': budget_check['reason'], 'details': budget_check}
-        
-        response = ec2_client.describe_instances(InstanceIds=[instance_id])
-        instance = response['Reservations'][0]['Instances'][0]
-        current_state = instance['State']['Name']
-        current_type = instance['InstanceType']
-        
-        if current_state != 'stopped':
-            return {
-                'success': False,
-                'error': f"Instance must be stopped. Current: {current_state}"
-            }
-        
-        # Create AMI backup
-        if create_backup:
-            backup_result = create_ami_backup(
-                instance_id,
-                description=f"Pre-resize backup: {current_type} to {new_instance_type}"
-            )
-            
-            if not backup_result['success']:
-                return {
-                    'success': False,
-                    'error': 'Failed to create AMI backup',
-                    'backup_error': backup_result.get('error')
-                }
+    budget_check = check_budget_limits(new_instance_type)
+    if not budget_check['allowed']:
+        return {'success': False, 'error': budget_check['reason'], 'details': budget_check}
+    
+    response = ec2_client.describe_instances(InstanceIds=[instance_id])
+    instance = response['Reservations'][0]['Instances'][0]
+    current_state = instance['State']['Name']
+    current_type = instance['InstanceType']
+    
+    if current_state != 'stopped':
+        return {
+            'success': False,
+            'error': f"Instance must be stopped. Current: {current_state}"
+        }
+    
+    # Create AMI backup
+    if create_backup:
+        backup_result = create_ami_backup(
+            instance_id,
+            description=f"Pre-resize backup: {current_type} to {new_instance_type}",
+            instance=instance
+        )
         
-        # Require confirmation
-        if not confirmation_token:
-            token = generate_confirmation_token('change_instance_type', 
-                                               {'instance_id': instance_id, 'new_type': new_instance_type})
-            
-            cost_diff = budget_check['monthly_cost'] - (INSTANCE_PRICING.get(current_type, 0) * 730)
-            
+        if not backup_result['success']:
             return {
                 'success': False,
-                'requires_confirmation': True,
-                'confirmation_token': token,
-                'change_details': {
-                    'current_type': current_type,
-                    'new_type': new_instance_type,
-                    'cost_impact': f"${abs(cost_diff):.2f}/month {'increase' if cost_diff > 0 else 'decrease'}"
-                },
-                'backup_created': create_backup,
-                'message': f"Confirm resize. Token: {token}"
+                'error': 'Failed to create AMI backup',
+                'backup_error': backup_result.get('error')
             }
+    
+    # Require confirmation
+    if not confirmation_token:
+        token = generate_confirmation_token('change_instance_type', 
+                                           {'instance_id': instance_id, 'new_type': new_instance_type})
         
-        # Verify token
-        token_verify = verify_confirmation_token(confirmation_token)
-        if not token_verify['valid']:
-            return {'success': False, 'error': token_verify['error']}
-        
-        # Modify
-        ec2_client.modify_instance_attribute(
-            InstanceId=instance_id,
-            InstanceType={'Value': new_instance_type}
-        )
-        
-        log_action('change_instance_type', 
-                  {'instance_id': instance_id, 'old_type': current_type, 'new_type': new_instance_type}, 
-                  'success')
+        cost_diff = budget_check['monthly_cost'] - INSTANCE_PRICING_MONTHLY.get(current_type, 0)
         
         return {
-            'success': True,
-            'instance_id': instance_id,
-            'old_type': current_type,
-            'new_type': new_instance_type,
-            'cost_estimate': budget_check,
-            'message': f"Type changed: {current_type} → {new_instance_type}"
+            'success': False,
+            'requires_confirmation': True,
+            'confirmation_token': token,
+            'change_details': {
+                'current_type': current_type,
+                'new_type': new_instance_type,
+                'cost_impact': f"${abs(cost_diff):.2f}/month {'increase' if cost_diff > 0 else 'decrease'}"
+            },
+            'backup_created': create_backup,
+            'message': f"Confirm resize. Token: {token}"
         }
     
-    except ClientError as e:
-        log_action('change_instance_type', {'instance_id': instance_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    # Verify token
+    token_verify = verify_confirmation_token(confirmation_token)
+    if not token_verify['valid']:
+        return {'success': False, 'error': token_verify['error']}
+    
+    # Modify
+    ec2_client.modify_instance_attribute(
+        InstanceId=instance_id,
+        InstanceType={'Value': new_instance_type}
+    )
+    
+    log_action('change_instance_type', 
+              {'instance_id': instance_id, 'old_type': current_type, 'new_type': new_instance_type}, 
+              'success')
+    
+    return {
+        'success': True,
+        'instance_id': instance_id,
+        'old_type': current_type,
+        'new_type': new_instance_type,
+        'cost_estimate': budget_check,
+        'message': f"Type changed: {current_type} → {new_instance_type}"
+    }
 
 # =====================================================
 # EBS VOLUME OPERATIONS (SIMPLIFIED)
 # =====================================================
 
-def list_ebs_volumes(instance_id=None):
-    """List EBS volumes"""
-    try:
-        params = {}
-        if instance_id:
-            params['Filters'] = [{'Name': 'attachment.instance-id', 'Values': [instance_id]}]
-        
-        response = ec2_client.describe_volumes(**params)
-        
-        volumes = []
-        for volume in response['Volumes']:
-            volume_info = {
-                'VolumeId': volume['VolumeId'],
-                'Size': volume['Size'],
-                'VolumeType': volume['VolumeType'],
-                'State': volume['State'],
-                'Attachments': [
-                    {'InstanceId': att['InstanceId'], 'Device': att['Device']}
-                    for att in volume.get('Attachments', [])
-                ]
-            }
-            volumes.append(volume_info)
-        
-        return {'success': True, 'volumes': volumes, 'count': len(volumes)}
+def _project_volume(volume):
+    """Trimmed view of a DescribeVolumes volume"""
+    return {
+        'VolumeId': volume['VolumeId'],
+        'Size': volume['Size'],
+        'VolumeType': volume['VolumeType'],
+        'State': volume['State'],
+        'Attachments': [
+            {'InstanceId': att['InstanceId'], 'Device': att['Device']}
+            for att in volume.get('Attachments', [])
+        ]
+    }
+
+@_awscall()
+def list_ebs_volumes(instance_id=None, limit=500):
+    """List EBS volumes (at most `limit`)"""
+    if instance_id:
+        params = {'Filters': [{'Name': 'attachment.instance-id', 'Values': [instance_id]}]}
+    else:
+        params = {'Filters': [{'Name': 'status', 'Values': LISTED_VOLUME_STATES}]}
     
-    except ClientError as e:
-        return {'success': False, 'error': str(e)}
+    paginator = ec2_client.get_paginator('describe_volumes')
+    pages = paginator.paginate(PaginationConfig={'MaxItems': limit, 'PageSize': 100}, **params)
+    
+    volumes = []
+    for page in pages:
+        volumes.extend(_project_volume(volume) for volume in page['Volumes'])
+    
+    result = {'success': True, 'volumes': volumes, 'count': len(volumes)}
+    if pages.resume_token:
+        result['truncated'] = True
+    return result
+
+@functools.lru_cache(maxsize=1)
+def _default_az():
+    """First availability zone in the region (cached for the container lifetime)"""
+    azs = ec2_client.describe_availability_zones()
+    return azs['AvailabilityZones'][0]['ZoneName']
 
+@_awscall('create_volume', 'size')
 def create_ebs_volume(size, volume_type='gp3', availability_zone=None):
     """Create EBS volume"""
-    try:
-        if not availability_zone:
-            azs = ec2_client.describe_availability_zones()
-            availability_zone = azs['AvailabilityZones'][0]['ZoneName']
-        
-        response = ec2_client.create_volume(
-            Size=size,
-            VolumeType=volume_type,
-            AvailabilityZone=availability_zone
-        )
-        
-        log_action('create_volume', {'size': size, 'type': volume_type}, 'success', 
-                  {'volume_id': response['VolumeId']})
-        
-        return {
-            'success': True,
-            'volume_id': response['VolumeId'],
-            'size': response['Size'],
-            'message': f"Volume {response['VolumeId']} created"
-        }
+    if not availability_zone:
+        availability_zone = _default_az()
     
-    except ClientError as e:
-        log_action('create_volume', {'size': size}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    response = ec2_client.create_volume(
+        Size=size,
+        VolumeType=volume_type,
+        AvailabilityZone=availability_zone
+    )
+    
+    log_action('create_volume', {'size': size, 'type': volume_type}, 'success', 
+              {'volume_id': response['VolumeId']})
+    
+    return {
+        'success': True,
+        'volume_id': response['VolumeId'],
+        'size': response['Size'],
+        'message': f"Volume {response['VolumeId']} created"
+    }
 
+@_awscall('attach_volume', 'volume_id')
 def attach_ebs_volume(volume_id, instance_id, device):
     """Attach volume"""
-    try:
-        response = ec2_client.attach_volume(
-            VolumeId=volume_id,
-            InstanceId=instance_id,
-            Device=device
-        )
-        
-        log_action('attach_volume', {'volume_id': volume_id, 'instance_id': instance_id}, 'success')
-        
-        return {
-            'success': True,
-            'volume_id': volume_id,
-            'instance_id': instance_id,
-            'device': device,
-            'message': f"Volume attached"
-        }
+    response = ec2_client.attach_volume(
+        VolumeId=volume_id,
+        InstanceId=instance_id,
+        Device=device
+    )
     
-    except ClientError as e:
-        log_action('attach_volume', {'volume_id': volume_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    log_action('attach_volume', {'volume_id': volume_id, 'instance_id': instance_id}, 'success')
+    
+    return {
+        'success': True,
+        'volume_id': volume_id,
+        'instance_id': instance_id,
+        'device': device,
+        'message': f"Volume attached"
+    }
 
+@_awscall('detach_volume', 'volume_id')
 def detach_ebs_volume(volume_id):
     """Detach volume"""
-    try:
-        response = ec2_client.detach_volume(VolumeId=volume_id)
-        
-        log_action('detach_volume', {'volume_id': volume_id}, 'success')
-        
-        return {
-            'success': True,
-            'volume_id': volume_id,
-            'message': f"Volume {volume_id} detached"
-        }
+    response = ec2_client.detach_volume(VolumeId=volume_id)
     
-    except ClientError as e:
-        log_action('detach_volume', {'volume_id': volume_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    log_action('detach_volume', {'volume_id': volume_id}, 'success')
+    
+    return {
+        'success': True,
+        'volume_id': volume_id,
+        'message': f"Volume {volume_id} detached"
+    }
 
+@_awscall('delete_volume', 'volume_id', retry=False)
 def delete_ebs_volume(volume_id, confirmation_token=None):
     """Delete volume"""
-    try:
-        response = ec2_client.describe_volumes(VolumeIds=[volume_id])
-        volume = response['Volumes'][0]
-        
-        if volume['Attachments']:
-            return {'success': False, 'error': f"Volume attached. Detach first."}
-        
-        if not confirmation_token:
-            token = generate_confirmation_token('delete_volume', {'volume_id': volume_id})
-            log_action('delete_volume', {'volume_id': volume_id}, 'requires_confirmation')
-            
-            return {
-                'success': False,
-                'requires_confirmation': True,
-                'confirmation_token': token,
-                'message': f"⚠️ Confirm deletion. Token: {token}"
-            }
-        
-        token_verify = verify_confirmation_token(confirmation_token)
-        if not token_verify['valid']:
-            return {'success': False, 'error': token_verify['error']}
-        
-        ec2_client.delete_volume(VolumeId=volume_id)
-        
-        log_action('delete_volume', {'volume_id': volume_id}, 'success')
+    # First step only issues a token; volume state is checked right before deleting
+    if not confirmation_token:
+        token = generate_confirmation_token('delete_volume', {'volume_id': volume_id})
+        log_action('delete_volume', {'volume_id': volume_id}, 'requires_confirmation')
         
         return {
-            'success': True,
-            'volume_id': volume_id,
-            'message': f"Volume {volume_id} deleted"
+            'success': False,
+            'requires_confirmation': True,
+            'confirmation_token': token,
+            'message': f"⚠️ Confirm deletion. Token: {token}"
         }
     
-    except ClientError as e:
-        log_action('delete_volume', {'volume_id': volume_id}, 'failed', error=str(e))
-        return {'success': False, 'error': str(e)}
+    token_verify = verify_confirmation_token(confirmation_token)
+    if not token_verify['valid']:
+        return {'success': False, 'error': token_verify['error']}
+    
+    response = ec2_client.describe_volumes(VolumeIds=[volume_id])
+    volume = response['Volumes'][0]
+    
+    if volume['Attachments']:
+        return {'success': False, 'error': f"Volume attached. Detach first."}
+    
+    ec2_client.delete_volume(VolumeId=volume_id)
+    
+    log_action('delete_volume', {'volume_id': volume_id}, 'success')
+    
+    return {
+        'success': True,
+        'volume_id': volume_id,
+        'message': f"Volume {volume_id} deleted"
+    }
 
 # =====================================================
 # AI PROCESSING
 # =====================================================
 
-def query_bedrock(user_query, context):
-    """Query Bedrock AI"""
-    system_prompt = """You are an AWS EC2 management assistant with safety features.
+BEDROCK_CACHE_TTL = 60  # seconds
+
+def _invoke_model_text(body):
+    """Send a serialized request body to the model and return the response text"""
+    response = _get_bedrock().invoke_model(
+        modelId=MODEL_ID,
+        body=body
+    )
+    
+    response_body = _loads(response['body'].read())
+    return response_body['content'][0]['text']
+
+@functools.lru_cache(maxsize=256)
+def _invoke_model_text_cached(body, ttl_bucket):
+    """_invoke_model_text memoized per body; ttl_bucket changes every BEDROCK_CACHE_TTL seconds"""
+    return _invoke_model_text(body)
+
+def _invoke_bedrock(request_body):
+    """Model response text; deterministic (temperature 0) requests are reused for a short time"""
+    body = _dumps(request_body)
+    if request_body.get('temperature') == 0:
+        return _invoke_model_text_cached(body, int(time.time() // BEDROCK_CACHE_TTL))
+    return _invoke_model_text(body)
+
+_SYSTEM_PROMPT = """You are an AWS EC2 management assistant with safety features.
 
 Key capabilities:
 - EC2 instance management (launch, stop, start, terminate, resize)
@@ -909,7 +1218,22 @@ When suggesting actions:
 - Explain confirmation process
 - Suggest monitoring/alarms
 """
-    
+
+# Invariant parts of the Bedrock request bodies
+_ANSWER_REQUEST = {
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": 2000,
+    "temperature": 0.7,
+    "system": _SYSTEM_PROMPT
+}
+_PARSE_REQUEST = {
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": 500,
+    "temperature": 0
+}
+
+def query_bedrock(user_query, context):
+    """Query Bedrock AI"""
     user_message = f"""Context: {context}
 
 User Request: {user_query}
@@ -917,69 +1241,58 @@ User Request: {user_query}
 Provide helpful guidance."""
 
     try:
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 2000,
-            "temperature": 0.7,
-            "system": system_prompt,
-            "messages": [{"role": "user", "content": user_message}]
-        }
-        
-        response = bedrock_runtime.invoke_model(
-            modelId=MODEL_ID,
-            body=json.dumps(request_body)
-        )
+        request_body = {**_ANSWER_REQUEST, "messages": [{"role": "user", "content": user_message}]}
         
-        response_body = json.loads(response['body'].read())
-        return response_body['content'][0]['text']
+        return _invoke_bedrock(request_body)
         
     except ClientError as e:
         return "Sorry, couldn't process request."
 
+# action -> (handler, how parameters are passed)
+# 'kwargs': handler(**parameters); 'none': handler(); 'logs': get_action_logs options;
+# any other style names the single parameter passed positionally
+ACTION_DISPATCH = {
+    'list_instances': (list_ec2_instances, 'none'),
+    'launch_instance': (launch_ec2_instance, 'kwargs'),
+    'terminate_instance': (terminate_ec2_instance, 'kwargs'),
+    'start_instance': (start_ec2_instance, 'instance_id'),
+    'stop_instance': (stop_ec2_instance, 'instance_id'),
+    'change_instance_type': (change_instance_type, 'kwargs'),
+    'check_ami_backup': (check_ami_backup_status, 'instance_id'),
+    'create_ami_backup': (create_ami_backup, 'kwargs'),
+    'create_ami_backups': (create_ami_backups_bulk, 'kwargs'),
+    'list_amis': (list_instance_amis, 'instance_id'),
+    'create_cpu_alarm': (create_cpu_alarm, 'kwargs'),
+    'create_status_alarm': (create_status_check_alarm, 'kwargs'),
+    'list_alarms': (list_instance_alarms, 'instance_id'),
+    'delete_alarm': (delete_alarm, 'alarm_name'),
+    'list_volumes': (list_ebs_volumes, 'instance_id'),
+    'create_volume': (create_ebs_volume, 'kwargs'),
+    'attach_volume': (attach_ebs_volume, 'kwargs'),
+    'detach_volume': (detach_ebs_volume, 'volume_id'),
+    'delete_volume': (delete_ebs_volume, 'kwargs'),
+    'get_action_logs': (get_action_logs, 'logs'),
+}
+
 def process_ec2_action(action, parameters):
     """Execute actions"""
     action = action.lower()
     
-    if action == 'list_instances':
-        return list_ec2_instances()
-    elif action == 'launch_instance':
-        return launch_ec2_instance(**parameters)
-    elif action == 'terminate_instance':
-        return terminate_ec2_instance(**parameters)
-    elif action == 'start_instance':
-        return start_ec2_instance(parameters.get('instance_id'))
-    elif action == 'stop_instance':
-        return stop_ec2_instance(parameters.get('instance_id'))
-    elif action == 'change_instance_type':
-        return change_instance_type(**parameters)
-    elif action == 'check_ami_backup':
-        return check_ami_backup_status(parameters.get('instance_id'))
-    elif action == 'create_ami_backup':
-        return create_ami_backup(**parameters)
-    elif action == 'list_amis':
-        return list_instance_amis(parameters.get('instance_id'))
-    elif action == 'create_cpu_alarm':
-        return create_cpu_alarm(**parameters)
-    elif action == 'create_status_alarm':
-        return create_status_check_alarm(**parameters)
-    elif action == 'list_alarms':
-        return list_instance_alarms(parameters.get('instance_id'))
-    elif action == 'delete_alarm':
-        return delete_alarm(parameters.get('alarm_name'))
-    elif action == 'list_volumes':
-        return list_ebs_volumes(parameters.get('instance_id'))
-    elif action == 'create_volume':
-        return create_ebs_volume(**parameters)
-    elif action == 'attach_volume':
-        return attach_ebs_volume(**parameters)
-    elif action == 'detach_volume':
-        return detach_ebs_volume(parameters.get('volume_id'))
-    elif action == 'delete_volume':
-        return delete_ebs_volume(**parameters)
-    elif action == 'get_action_logs':
-        return get_action_logs(limit=parameters.get('limit', 50))
-    else:
+    entry = ACTION_DISPATCH.get(action)
+    if entry is None:
         return {'success': False, 'error': f'Unknown action: {action}'}
+    
+    handler, style = entry
+    if style == 'kwargs':
+        return handler(**parameters)
+    if style == 'none':
+        return handler()
+    if style == 'logs':
+        return handler(limit=parameters.get('limit', 50), action_filter=parameters.get('action_filter'))
+    return handler(parameters.get(style))
+
+# Leading BOM/```json fence and trailing ``` fence around model JSON output
+_JSON_FENCE = re.compile(r'^\ufeff?\s*```(?:json)?|```\s*$')
 
 def parse_user_intent(user_query):
     """Parse intent using AI"""
@@ -987,7 +1300,7 @@ def parse_user_intent(user_query):
 
 Available actions:
 - list_instances, launch_instance, terminate_instance, start_instance, stop_instance, change_instance_type
-- check_ami_backup, create_ami_backup, list_amis
+- check_ami_backup, create_ami_backup, create_ami_backups (parameters: instance_ids list), list_amis
 - create_cpu_alarm, create_status_alarm, list_alarms, delete_alarm
 - list_volumes, create_volume, attach_volume, detach_volume, delete_volume
 - get_action_logs
@@ -998,82 +1311,136 @@ Return ONLY JSON: {{"action": "...", "parameters": {{...}}}}
 """
     
     try:
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 500,
-            "temperature": 0,
-            "messages": [{"role": "user", "content": parsing_prompt}]
-        }
-        
-        response = bedrock_runtime.invoke_model(
-            modelId=MODEL_ID,
-            body=json.dumps(request_body)
-        )
+        request_body = {**_PARSE_REQUEST, "messages": [{"role": "user", "content": parsing_prompt}]}
         
-        response_body = json.loads(response['body'].read())
-        response_text = response_body['content'][0]['text'].strip()
+        response_text = _invoke_bedrock(request_body)
         
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        return json.loads(response_text.strip())
+        return _loads(_JSON_FENCE.sub('', response_text).strip())
         
     except Exception as e:
         print(f"Error parsing intent: {e}")
         return {'action': 'help', 'parameters': {}}
 
+def _format_action_response(action_result):
+    """Templated answer for a successful action with a message, or None if the model should respond"""
+    if not action_result.get('success') or 'message' not in action_result:
+        return None
+    
+    lines = [f"✅ **{action_result['message']}**"]
+    for key, value in action_result.items():
+        if key not in ('success', 'message') and isinstance(value, (str, int, float, bool)):
+            lines.append(f"- {key}: {value}")
+    
+    return '\n'.join(lines)
+
+# Query routing keywords, matched against whole words (so "restart" is not "start")
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_MUTATING_KW = frozenset({
+    'launch', 'terminate', 'stop', 'start', 'delete', 'create', 'attach', 'detach', 'change'
+})
+_ACTION_KW = _MUTATING_KW | {'backup', 'backups', 'alarm', 'alarms', 'ami', 'amis', 'log', 'logs'}
+_INSTANCE_KW = frozenset({'instance', 'instances', 'ec2'})
+_ALARM_KW = frozenset({'alarm', 'alarms', 'monitor', 'monitoring'})
+_LOG_KW = frozenset({'log', 'logs', 'history', 'action', 'actions'})
+_AMI_KW = frozenset({'backup', 'backups', 'ami', 'amis'})
+# Words that tie a question to this account's fleet ("how many servers are running?")
+_FLEET_KW = frozenset({
+    'server', 'servers', 'running', 'stopped', 'volume', 'volumes',
+    'cost', 'costs', 'spend', 'spending', 'spent', 'bill', 'my', 'our'
+})
+_ENTITY_KW = _INSTANCE_KW | _ALARM_KW | _LOG_KW | _AMI_KW | _FLEET_KW
+# Resource IDs ("what is the state of i-0abc123?") always tie a question to the fleet
+_RESOURCE_ID_RE = re.compile(r'\b(?:i|vol|ami|snap|sg|subnet|vpc)-[0-9a-f]+')
+_QUESTION_PREFIXES = ('what', 'how', 'why', 'when', 'explain', 'describe ')
+# Read-only phrasing ("show my backups", "which instances have an ami?") is answered
+# from fetched context rather than parsed into an action
+_READ_PREFIXES = _QUESTION_PREFIXES + ('show', 'list', 'which', 'do ', 'does ', 'are ', 'is ', 'any ')
+
+def _first_instance_ids(instances_future, limit=3):
+    """IDs of the first few listed instances (empty if listing failed)"""
+    instances_result = instances_future.result()
+    if not instances_result['success']:
+        return []
+    
+    return [inst['InstanceId'] for inst in instances_result['instances'][:limit]]
+
 def process_user_query(user_query):
     """Process user query"""
     query_lower = user_query.lower()
+    tokens = set(_WORD_RE.findall(query_lower))
+    read_only = query_lower.lstrip().startswith(_READ_PREFIXES) and not tokens & _MUTATING_KW
     
-    action_keywords = ['launch', 'terminate', 'stop', 'start', 'delete', 'create', 
-                       'attach', 'detach', 'change', 'backup', 'alarm', 'ami', 'log']
-    is_action = any(keyword in query_lower for keyword in action_keywords)
-    
-    if is_action:
+    if tokens & _ACTION_KW and not read_only:
         intent = parse_user_intent(user_query)
         action = intent.get('action', 'help')
         parameters = intent.get('parameters', {})
         
         action_result = process_ec2_action(action, parameters)
         
+        # Persist the audit trail of the action before any (slow) Bedrock call, so a
+        # timeout in the explanation step cannot lose the record of what was done
+        flush_logs()
+        
         if not action_result.get('success', False) and action_result.get('requires_confirmation', False):
             return json.dumps(action_result, indent=2)
         
-        context = f"Action: {action}\nResult: {json.dumps(action_result, indent=2)}"
+        # Successful actions are answered locally; the model only explains failures and listings
+        if not VERBOSE:
+            response = _format_action_response(action_result)
+            if response is not None:
+                return response
+        
+        context = f"Action: {action}\nResult: {_dumps(action_result)}"
         response = query_bedrock(user_query, context)
         return response
     
+    elif (query_lower.lstrip().startswith(_QUESTION_PREFIXES) and not tokens & _ENTITY_KW
+          and not _RESOURCE_ID_RE.search(query_lower)):
+        # General questions ("how do gp3 and io2 differ?") need no fleet data
+        return query_bedrock(user_query, '')
+    
     else:
-        context = ""
+        # Compact JSON: the model does not need indentation and it costs input tokens
+        sections = []
+        
+        wants_instances = bool(tokens & _INSTANCE_KW)
+        wants_alarms = bool(tokens & _ALARM_KW)
+        wants_logs = bool(tokens & _LOG_KW)
+        wants_amis = bool(tokens & _AMI_KW)
+        
+        # Instances are listed once and shared by every section (the fallback included)
+        needs_instances = wants_instances or wants_alarms or wants_amis or not wants_logs
+        
+        # Independent lookups run concurrently on the shared pool; the Bedrock client
+        # (cold containers only) is built while the context is being fetched
+        _submit(_get_bedrock)
+        instances_future = _submit(list_ec2_instances) if needs_instances else None
+        logs_future = _submit(get_action_logs, limit=20) if wants_logs else None
         
-        if any(word in query_lower for word in ['instance', 'instances', 'ec2']):
-            instances = list_ec2_instances()
-            context += f"\n=== INSTANCES ===\n{json.dumps(instances, indent=2)}"
+        instance_ids = _first_instance_ids(instances_future) if wants_alarms or wants_amis else []
+        alarm_futures = [(iid, _submit(list_instance_alarms, iid)) for iid in instance_ids] if wants_alarms else []
+        # One DescribeImages call covers every listed instance
+        amis_future = _submit(list_amis_by_instance, instance_ids) if wants_amis and instance_ids else None
         
-        if any(word in query_lower for word in ['alarm', 'monitor']):
-            instances_result = list_ec2_instances()
-            if instances_result['success']:
-                for inst in instances_result['instances'][:3]:
-                    alarms = list_instance_alarms(inst['InstanceId'])
-                    context += f"\n=== ALARMS {inst['InstanceId']} ===\n{json.dumps(alarms, indent=2)}"
+        if wants_instances:
+            sections.append(f"=== INSTANCES ===\n{_dumps(instances_future.result())}")
         
-        if any(word in query_lower for word in ['log', 'history', 'action']):
-            logs = get_action_logs(limit=20)
-            context += f"\n=== ACTION LOGS ===\n{json.dumps(logs, indent=2)}"
+        for instance_id, future in alarm_futures:
+            sections.append(f"=== ALARMS {instance_id} ===\n{_dumps(future.result())}")
         
-        if any(word in query_lower for word in ['backup', 'ami']):
-            instances_result = list_ec2_instances()
-            if instances_result['success']:
-                for inst in instances_result['instances'][:3]:
-                    amis = list_instance_amis(inst['InstanceId'])
-                    context += f"\n=== AMIs {inst['InstanceId']} ===\n{json.dumps(amis, indent=2)}"
+        if logs_future:
+            sections.append(f"=== ACTION LOGS ===\n{_dumps(logs_future.result())}")
         
-        if not context:
-            instances = list_ec2_instances()
-            context = f"=== INSTANCES ===\n{json.dumps(instances, indent=2)}"
+        if amis_future:
+            amis_result = amis_future.result()
+            for instance_id in instance_ids:
+                amis = amis_result['results'][instance_id] if amis_result['success'] else amis_result
+                sections.append(f"=== AMIs {instance_id} ===\n{_dumps(amis)}")
+        
+        if not sections:
+            sections.append(f"=== INSTANCES ===\n{_dumps(instances_future.result())}")
+        
+        context = '\n'.join(sections)
         
         response = query_bedrock(user_query, context)
         return response
@@ -1082,13 +1449,16 @@ def process_user_query(user_query):
 # LAMBDA HANDLER
 # =====================================================
 
+RESPONSE_HEADERS = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+
 def lambda_handler(event, context):
     """Lambda handler with DynamoDB logging and user email tracking"""
-    print(f"Event: {json.dumps(event)}")
+    if DEBUG:
+        print(f"Event: {_dumps(event)[:512]}")
     
     try:
         if 'body' in event:
-            body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
+            body = _loads(event['body']) if isinstance(event['body'], str) else event['body']
         else:
             body = event
         
@@ -1098,21 +1468,24 @@ def lambda_handler(event, context):
         if not user_query:
             return {
                 'statusCode': 400,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'error': 'No query provided'})
+                'headers': RESPONSE_HEADERS,
+                'body': _dumps({'error': 'No query provided'})
             }
         
-        print(f"Processing: {user_query} from user: {user_email}")
+        if DEBUG:
+            print(f"Processing: {user_query[:512]} from user: {user_email}")
         
         # Store user email in context for logging
-        os.environ['CURRENT_USER_EMAIL'] = user_email
-        
-        response_text = process_user_query(user_query)
+        email_token = CURRENT_USER_EMAIL.set(user_email)
+        try:
+            response_text = process_user_query(user_query)
+        finally:
+            CURRENT_USER_EMAIL.reset(email_token)
         
         return {
             'statusCode': 200,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({
+            'headers': RESPONSE_HEADERS,
+            'body': _dumps({
                 'query': user_query,
                 'response': response_text,
                 'timestamp': datetime.now().isoformat(),
@@ -1123,11 +1496,14 @@ def lambda_handler(event, context):
         
     except Exception as e:
         print(f"Error: {e}")
-        import traceback
         traceback.print_exc()
         
         return {
             'statusCode': 500,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': str(e)})
-        }
\ No newline at end of file
+            'headers': RESPONSE_HEADERS,
+            'body': _dumps({'error': str(e)})
+        }
+    
+    finally:
+        # Write all action logs from this invocation in as few round-trips as possible
+        flush_logs()
\ No newline at end of file
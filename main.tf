@@ -14,9 +14,29 @@ resource "aws_dynamodb_table" "action_logs" {
     type = "S"
   }
   
+  attribute {
+    name = "log_bucket"
+    type = "S"
+  }
+  
+  attribute {
+    name = "action_ts"
+    type = "S"
+  }
+  
+  # Constant partition + timestamp sort key: newest-first reads without a Scan
+  global_secondary_index {
+    name            = "ByTimestamp"
+    hash_key        = "log_bucket"
+    range_key       = "timestamp"
+    projection_type = "ALL"
+  }
+  
+  # "<action>#<timestamp>" sort key: per-action reads via begins_with
   global_secondary_index {
-    name            = "timestamp-index"
-    hash_key        = "timestamp"
+    name            = "ByActionTs"
+    hash_key        = "log_bucket"
+    range_key       = "action_ts"
     projection_type = "ALL"
   }
   
@@ -112,6 +132,7 @@ resource "aws_iam_role_policy" "ec2_manager_lambda_policy" {
         Effect = "Allow"
         Action = [
           "dynamodb:PutItem",
+          "dynamodb:BatchWriteItem",
           "dynamodb:GetItem",
           "dynamodb:DeleteItem",
           "dynamodb:Scan",
@@ -160,6 +181,41 @@ data "archive_file" "ec2_manager_lambda_zip" {
   output_path = "${path.module}/ec2-manager-deployment.zip"
 }
 
+# Dependency layer (orjson, zstandard, ciso8601), built as manylinux wheels for the runtime
+resource "null_resource" "ec2_manager_deps" {
+  triggers = {
+    requirements = filesha256("${path.module}/layer/requirements.txt")
+    # Rebuild on a fresh checkout, where the (git-ignored) build directory is missing
+    built = fileexists("${path.module}/build/layer/requirements.txt")
+  }
+
+  provisioner "local-exec" {
+    command = <<-EOT
+      rm -rf "${path.module}/build/layer"
+      pip install -r "${path.module}/layer/requirements.txt" \
+        --target "${path.module}/build/layer/python" \
+        --platform manylinux2014_x86_64 --implementation cp --python-version 3.11 \
+        --only-binary=:all:
+      cp "${path.module}/layer/requirements.txt" "${path.module}/build/layer/requirements.txt"
+    EOT
+  }
+}
+
+data "archive_file" "ec2_manager_deps_zip" {
+  type        = "zip"
+  source_dir  = "${path.module}/build/layer"
+  output_path = "${path.module}/ec2-manager-deps.zip"
+
+  depends_on = [null_resource.ec2_manager_deps]
+}
+
+resource "aws_lambda_layer_version" "ec2_manager_deps" {
+  layer_name          = "${var.project_name}-ec2-manager-deps"
+  filename            = data.archive_file.ec2_manager_deps_zip.output_path
+  source_code_hash    = data.archive_file.ec2_manager_deps_zip.output_base64sha256
+  compatible_runtimes = ["python3.11"]
+}
+
 # Lambda Function
 resource "aws_lambda_function" "ec2_manager" {
   filename         = data.archive_file.ec2_manager_lambda_zip.output_path
@@ -168,6 +224,7 @@ resource "aws_lambda_function" "ec2_manager" {
   handler         = "lambda_handler.lambda_handler"
   source_code_hash = data.archive_file.ec2_manager_lambda_zip.output_base64sha256
   runtime         = "python3.11"
+  layers          = [aws_lambda_layer_version.ec2_manager_deps.arn]
   timeout         = 60
   memory_size     = 512
 
@@ -0,0 +1,55 @@
+"""One-off backfill of action log items written before the ByTimestamp/ByActionTs GSIs.
+
+Older items have no `log_bucket`/`action_ts` attributes, so they are missing from
+both indexes and get_action_logs cannot see them. Run once after deploying:
+
+    python scripts/backfill_action_logs.py --table ec2-manager-action-logs
+"""
+import argparse
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+# Must match ACTION_LOG_BUCKET in lambda/lambda_handler.py
+ACTION_LOG_BUCKET = 'all'
+
+
+def backfill(table_name, region=None):
+    """Add the GSI key attributes to every log item that lacks them"""
+    table = boto3.resource('dynamodb', region_name=region).Table(table_name)
+
+    params = {
+        'FilterExpression': Attr('log_bucket').not_exists(),
+        'ProjectionExpression': 'log_id, #ts, #action',
+        'ExpressionAttributeNames': {'#ts': 'timestamp', '#action': 'action'}
+    }
+
+    updated = 0
+    while True:
+        response = table.scan(**params)
+
+        for item in response.get('Items', []):
+            table.update_item(
+                Key={'log_id': item['log_id']},
+                UpdateExpression='SET log_bucket = :bucket, action_ts = :action_ts',
+                ExpressionAttributeValues={
+                    ':bucket': ACTION_LOG_BUCKET,
+                    ':action_ts': f"{item['action']}#{item['timestamp']}"
+                }
+            )
+            updated += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    return updated
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill GSI keys on existing action log items')
+    parser.add_argument('--table', required=True, help='Action log table name')
+    parser.add_argument('--region', help='AWS region (defaults to the configured one)')
+    args = parser.parse_args()
+
+    print(f"Backfilled {backfill(args.table, args.region)} action log items")